@@ -1,5 +1,6 @@
 import pygame
 import collections
+import itertools
 import random
 
 # --- Constants & Configuration ---
@@ -24,10 +25,43 @@ COLOR_FRONTIER = (255, 200, 0)  # Yellow (In Queue)
 COLOR_VISITED = (0, 100, 200)   # Blue (Done)
 COLOR_PATH = (0, 255, 0)        # Bright Green (Final Path)
 
+# Display states, in increasing priority; a node's state_id indexes COLOR_TABLE
+STATE_UNVISITED, STATE_FRONTIER, STATE_VISITED, STATE_START, STATE_GOAL, STATE_CURRENT, STATE_PATH = range(7)
+COLOR_TABLE = (COLOR_UNVISITED, COLOR_FRONTIER, COLOR_VISITED, COLOR_START, COLOR_GOAL, COLOR_CURRENT, COLOR_PATH)
+
+# --- Drawing Helpers ---
+
+# Pre-drawn node circles (fill + white border), keyed by (color, radius)
+# Cached surfaces are converted to the display format when built, so this
+# (like the other lazy caches) must only be filled after display.set_mode
+CIRCLE_CACHE = {}
+
+def get_circle(color, radius):
+    surf = CIRCLE_CACHE.get((color, radius))
+    if surf is None:
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(surf, color, (radius, radius), radius)
+        pygame.draw.circle(surf, (255, 255, 255), (radius, radius), radius, 2) # Border
+        CIRCLE_CACHE[(color, radius)] = surf
+    return surf
+
+def wrap_text(text, font, max_width):
+    """Greedy word wrap, measured in pixels with the font that renders it."""
+    lines = []
+    current_line = []
+    for word in text.split(' '):
+        current_line.append(word)
+        if len(current_line) > 1 and font.size(' '.join(current_line))[0] > max_width:
+            lines.append(' '.join(current_line[:-1]))
+            current_line = [word]
+    lines.append(' '.join(current_line))
+    return lines
+
 # --- Classes ---
 
-class Node:
+class Node(pygame.sprite.DirtySprite):
     def __init__(self, id, x, y):
+        super().__init__()
         self.id = id
         self.x = x
         self.y = y
@@ -40,52 +74,34 @@ class Node:
         self.is_goal = False
         self.is_current = False
         self.in_final_path = False
+        self.state_id = STATE_UNVISITED # Cached display state, see update_state_id
 
-    def draw(self, screen, font):
-        # Determine color based on priority
-        color = COLOR_UNVISITED
-        
-        if self.in_final_path:
-            color = COLOR_PATH
-        elif self.is_current:
-            color = COLOR_CURRENT
-        elif self.is_start:
-            color = COLOR_START
-        elif self.is_goal:
-            color = COLOR_GOAL
-        elif self.state == 'frontier':
-            color = COLOR_FRONTIER
-        elif self.state == 'visited':
-            color = COLOR_VISITED
-
-        # Draw connection lines (Edges)
-        for child in self.children:
-            # Line color logic: highlight if part of final path
-            line_color = EDGE_COLOR
-            if self.in_final_path and child.in_final_path and child.parent == self:
-                line_color = COLOR_PATH
-                width = 4
-            else:
-                width = 2
-            pygame.draw.line(screen, line_color, (self.x, self.y), (child.x, child.y), width)
-
-    def draw_node_body(self, screen, font):
-        # We draw the body separately so it sits on top of lines
-        color = COLOR_UNVISITED
-        if self.in_final_path: color = COLOR_PATH
-        elif self.is_current: color = COLOR_CURRENT
-        elif self.is_start: color = COLOR_START
-        elif self.is_goal: color = COLOR_GOAL
-        elif self.state == 'frontier': color = COLOR_FRONTIER
-        elif self.state == 'visited': color = COLOR_VISITED
-
-        pygame.draw.circle(screen, color, (self.x, self.y), NODE_RADIUS)
-        pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), NODE_RADIUS, 2) # Border
+        # Cached ID text, rendered on first draw (white normally, black on cyan)
+        self._id_surf_white = None
+        self._id_surf_black = None
+
+        # Sprite: the image is rebuilt only when state_id changes
+        self.image = None
+        self.rect = pygame.Rect(x - NODE_RADIUS, y - NODE_RADIUS, NODE_RADIUS * 2, NODE_RADIUS * 2)
+        self._image_state_id = None
+
+    def update(self, font):
+        """Swaps in a new image (and marks the sprite dirty) if the display state changed."""
+        if self._image_state_id == self.state_id:
+            return
+
+        image = get_circle(self.get_color(), NODE_RADIUS).copy()
         
         # Draw ID
-        text = font.render(str(self.id), True, (255,255,255) if color != COLOR_CURRENT else (0,0,0))
-        text_rect = text.get_rect(center=(self.x, self.y))
-        screen.blit(text, text_rect)
+        if self._id_surf_white is None:
+            self._id_surf_white = font.render(str(self.id), True, (255,255,255)).convert_alpha()
+            self._id_surf_black = font.render(str(self.id), True, (0,0,0)).convert_alpha()
+        text = self._id_surf_white if self.state_id != STATE_CURRENT else self._id_surf_black
+        image.blit(text, text.get_rect(center=(NODE_RADIUS, NODE_RADIUS)))
+
+        self.image = image
+        self._image_state_id = self.state_id
+        self.dirty = 1
 
     def reset(self):
         self.state = 'unvisited'
@@ -93,6 +109,20 @@ class Node:
         self.is_current = False
         self.in_final_path = False
         # Note: We do not reset is_start or is_goal here typically, unless full reset
+        self.update_state_id()
+
+    def get_color(self):
+        return COLOR_TABLE[self.state_id]
+
+    def update_state_id(self):
+        """Resolves the flags into one display state. Call after changing any of them."""
+        if self.in_final_path: self.state_id = STATE_PATH
+        elif self.is_current: self.state_id = STATE_CURRENT
+        elif self.is_start: self.state_id = STATE_START
+        elif self.is_goal: self.state_id = STATE_GOAL
+        elif self.state == 'frontier': self.state_id = STATE_FRONTIER
+        elif self.state == 'visited': self.state_id = STATE_VISITED
+        else: self.state_id = STATE_UNVISITED
 
 class SearchTree:
     def __init__(self):
@@ -100,16 +130,37 @@ class SearchTree:
         self.root = None
         self.start_node = None
         self.goal_node = None
+
+        # Edge geometry as polylines, so each draws with one pygame call
+        self.edge_points = []
+        self.path_points = []
+        # Background + static edges, rendered once per generated tree
+        self.edge_surface = pygame.Surface((WIDTH - SIDEBAR_WIDTH, HEIGHT)).convert()
+        # Node sprites; drawing them over edge_surface redraws only changed areas
+        self.sprites = pygame.sprite.LayeredDirty()
         
         # BFS Execution State
         self.queue = collections.deque()
+        self._current_ref = None # Node highlighted as 'current' by the last step
         self.running = False
         self.completed = False
         self.found = False
         self.message = "Select Start (L-Click) & Goal (R-Click)"
+        self.dirty = True # Redraw needed (set by anything that changes the scene)
+
+    @property
+    def message(self):
+        return self._message
+
+    @message.setter
+    def message(self, text):
+        self._message = text
+        self.message_surfs = None # Re-wrapped and rendered on next draw_sidebar
+        self.dirty = True
 
     def generate_tree(self):
         """Generates a balanced-ish tree structure for visualization."""
+        self.dirty = True
         self.nodes = []
         # Hardcoded structure to ensure it looks good on screen
         # Levels: y = 100, 200, 300...
@@ -148,16 +199,44 @@ class SearchTree:
                 gen_queue.append((child, x_min + span * i, x_min + span * (i+1), depth + 1))
                 count += 1
 
+        self.sprites = pygame.sprite.LayeredDirty(*self.nodes)
+        self.build_edge_points()
+        self.render_edge_surface()
+
+    def build_edge_points(self):
+        """Walks the tree depth-first so a single polyline traces every edge."""
+        self.edge_points = []
+        stack = [(self.root, iter(self.root.children))]
+        self.edge_points.append((self.root.x, self.root.y))
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if stack: # Walk back up to the parent
+                    self.edge_points.append((stack[-1][0].x, stack[-1][0].y))
+            else:
+                self.edge_points.append((child.x, child.y))
+                stack.append((child, iter(child.children)))
+
+    def render_edge_surface(self):
+        self.edge_surface.fill(BG_COLOR)
+        if len(self.edge_points) > 1:
+            pygame.draw.lines(self.edge_surface, EDGE_COLOR, False, self.edge_points, 2)
+        self.sprites.repaint_rect(self.edge_surface.get_rect())
+
     def handle_click(self, pos, button):
         """
         Button 1: Left Click (Set Start)
         Button 3: Right Click (Set Goal)
         """
         x, y = pos
-        # Check collision with nodes
+        r2 = NODE_RADIUS * NODE_RADIUS
+        # Check collision with nodes (compare squared distances, no sqrt)
         for node in self.nodes:
-            distance = ((x - node.x)**2 + (y - node.y)**2)**0.5
-            if distance < NODE_RADIUS:
+            dx = x - node.x
+            dy = y - node.y
+            if dx*dx + dy*dy < r2:
                 if button == 1: # Left Click -> Start
                     if self.start_node: self.start_node.is_start = False
                     node.is_start = True
@@ -171,20 +250,28 @@ class SearchTree:
                 return
 
     def reset_search(self):
+        self.dirty = True
         self.queue.clear()
         self.running = False
         self.completed = False
         self.found = False
         self.message = "Press SPACE to Step, 'R' to Full Reset"
+        if self.path_points:
+            # Erase the path highlight baked into the background
+            self.path_points = []
+            self.render_edge_surface()
+        self._current_ref = None
         for node in self.nodes:
             node.reset()
         
         if self.start_node and self.goal_node:
             self.queue.append(self.start_node)
             self.start_node.state = 'frontier'
+            self.start_node.update_state_id()
             self.message = "Ready. Queue initialized. Press SPACE."
 
     def step(self):
+        self.dirty = True
         if not self.running and not self.completed:
             self.running = True
         
@@ -199,12 +286,15 @@ class SearchTree:
         # 1. Dequeue
         current = self.queue.popleft()
         
-        # Reset previous current highlights
-        for n in self.nodes:
-            if n.is_current: n.is_current = False
+        # Reset previous current highlight
+        if self._current_ref is not None:
+            self._current_ref.is_current = False
+            self._current_ref.update_state_id()
             
         current.is_current = True
+        self._current_ref = current
         current.state = 'visited'
+        current.update_state_id()
 
         # 2. Check Goal
         if current == self.goal_node:
@@ -217,8 +307,10 @@ class SearchTree:
         # 3. Enqueue Children
         added_count = 0
         for child in current.children:
-            if child.state == 'unvisited' and child not in self.queue:
+            # 'unvisited' already means "never queued": it becomes 'frontier' on append
+            if child.state == 'unvisited':
                 child.state = 'frontier'
+                child.update_state_id()
                 child.parent = current
                 self.queue.append(child)
                 added_count += 1
@@ -229,42 +321,69 @@ class SearchTree:
         temp = current
         while temp:
             temp.in_final_path = True
+            temp.update_state_id()
+            self.path_points.append((temp.x, temp.y))
             temp = temp.parent
 
+        # The path is part of the background from now on (until reset), so it
+        # sits under the node sprites and is repainted with them
+        if len(self.path_points) > 1:
+            rect = pygame.draw.lines(self.edge_surface, COLOR_PATH, False, self.path_points, 4)
+            self.sprites.repaint_rect(rect)
+
 
 # --- Main Application ---
 
-def draw_sidebar(screen, font, tree):
-    # Sidebar Background
-    rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, SIDEBAR_BG, rect)
-    pygame.draw.line(screen, (100,100,100), (WIDTH - SIDEBAR_WIDTH, 0), (WIDTH - SIDEBAR_WIDTH, HEIGHT), 2)
+LEGEND_ITEMS = [
+    ("Start Node", COLOR_START),
+    ("Goal Node", COLOR_GOAL),
+    ("Current (Processing)", COLOR_CURRENT),
+    ("Frontier (In Queue)", COLOR_FRONTIER),
+    ("Visited", COLOR_VISITED),
+    ("Unvisited", COLOR_UNVISITED)
+]
+CONTROLS = [
+    "Left Click: Set Start",
+    "Right Click: Set Goal",
+    "SPACE: Step Forward",
+    "R: Reset Search",
+    "N: New Tree"
+]
+SIDEBAR_STATIC = None # Background, title and legend; built on first draw_sidebar call
+CONTROL_LABELS = []   # Rendered controls text (its position follows the queue)
+
+def build_sidebar_static(font, small_font):
+    """Renders the parts of the sidebar that never change onto one surface."""
+    surf = pygame.Surface((SIDEBAR_WIDTH, HEIGHT)).convert()
+    surf.fill(SIDEBAR_BG)
+    pygame.draw.line(surf, (100,100,100), (0, 0), (0, HEIGHT), 2)
 
     # Title
     title = font.render("BFS Simulation", True, (255, 255, 255))
-    screen.blit(title, (WIDTH - SIDEBAR_WIDTH + 20, 20))
+    surf.blit(title, (20, 20))
 
     # Legend
     y_offset = 70
-    legend_items = [
-        ("Start Node", COLOR_START),
-        ("Goal Node", COLOR_GOAL),
-        ("Current (Processing)", COLOR_CURRENT),
-        ("Frontier (In Queue)", COLOR_FRONTIER),
-        ("Visited", COLOR_VISITED),
-        ("Unvisited", COLOR_UNVISITED)
-    ]
-    
-    small_font = pygame.font.SysFont('arial', 18)
-    for text, color in legend_items:
-        pygame.draw.circle(screen, color, (WIDTH - SIDEBAR_WIDTH + 30, y_offset + 10), 8)
+    for text, color in LEGEND_ITEMS:
+        pygame.draw.circle(surf, color, (30, y_offset + 10), 8)
         label = small_font.render(text, True, TEXT_COLOR)
-        screen.blit(label, (WIDTH - SIDEBAR_WIDTH + 50, y_offset))
+        surf.blit(label, (50, y_offset))
         y_offset += 30
 
     # Separator
-    pygame.draw.line(screen, (100,100,100), (WIDTH - SIDEBAR_WIDTH + 10, y_offset + 10), (WIDTH - 10, y_offset + 10), 1)
-    y_offset += 30
+    pygame.draw.line(surf, (100,100,100), (10, y_offset + 10), (SIDEBAR_WIDTH - 10, y_offset + 10), 1)
+    return surf
+
+def draw_sidebar(screen, font, small_font, msg_font, tree):
+    global SIDEBAR_STATIC
+    if SIDEBAR_STATIC is None:
+        SIDEBAR_STATIC = build_sidebar_static(font, small_font)
+        for c in CONTROLS:
+            CONTROL_LABELS.append(small_font.render(c, True, (150, 150, 150)).convert_alpha())
+
+    # Background, title and legend
+    rect = screen.blit(SIDEBAR_STATIC, (WIDTH - SIDEBAR_WIDTH, 0))
+    y_offset = 70 + 30 * len(LEGEND_ITEMS) + 30 # Below the legend and separator
 
     # Queue Visualization
     queue_label = font.render(f"Queue (FIFO): {len(tree.queue)}", True, (255, 255, 255))
@@ -274,10 +393,7 @@ def draw_sidebar(screen, font, tree):
     # Draw Queue Items (limited to fit screen)
     # We draw them as blocks to look like a data structure
     queue_x = WIDTH - SIDEBAR_WIDTH + 20
-    for i, node in enumerate(tree.queue):
-        if i > 12: # Limit display
-            break
-        
+    for node in itertools.islice(tree.queue, 13): # Limit display
         # Color based on state
         q_color = COLOR_FRONTIER
         
@@ -296,38 +412,23 @@ def draw_sidebar(screen, font, tree):
     y_offset = max(y_offset + 50, 450)
     
     # Message / Status
-    msg_font = pygame.font.SysFont('arial', 20)
-    
-    # Split message into lines if too long
-    words = tree.message.split(' ')
-    lines = []
-    current_line = []
-    for word in words:
-        current_line.append(word)
-        if len(' '.join(current_line)) > 25:
-            lines.append(' '.join(current_line[:-1]))
-            current_line = [word]
-    lines.append(' '.join(current_line))
+    # Split message into lines if too long (only when the message changed)
+    if tree.message_surfs is None:
+        lines = wrap_text(tree.message, msg_font, SIDEBAR_WIDTH - 40)
+        tree.message_surfs = [msg_font.render(line, True, COLOR_CURRENT).convert_alpha() for line in lines]
 
     pygame.draw.rect(screen, (20, 20, 20), (WIDTH - SIDEBAR_WIDTH + 10, y_offset, SIDEBAR_WIDTH - 20, 100))
-    for i, line in enumerate(lines):
-        msg = msg_font.render(line, True, COLOR_CURRENT)
+    for i, msg in enumerate(tree.message_surfs):
         screen.blit(msg, (WIDTH - SIDEBAR_WIDTH + 20, y_offset + 10 + i * 25))
 
     # Controls
-    controls = [
-        "Left Click: Set Start",
-        "Right Click: Set Goal",
-        "SPACE: Step Forward",
-        "R: Reset Search",
-        "N: New Tree"
-    ]
     y_offset += 120
-    for c in controls:
-        c_text = small_font.render(c, True, (150, 150, 150))
+    for c_text in CONTROL_LABELS:
         screen.blit(c_text, (WIDTH - SIDEBAR_WIDTH + 20, y_offset))
         y_offset += 25
 
+    return rect # Area that changed, for pygame.display.update
+
 
 def main():
     pygame.init()
@@ -335,6 +436,8 @@ def main():
     pygame.display.set_caption("BFS Visualization - Interactive Learning")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont('arial', 24, bold=True)
+    small_font = pygame.font.SysFont('arial', 18)
+    msg_font = pygame.font.SysFont('arial', 20)
 
     tree = SearchTree()
     tree.generate_tree()
@@ -342,9 +445,20 @@ def main():
     running = True
     while running:
         # Event Handling
-        for event in pygame.event.get():
+        # The scene only changes on user input, so when nothing is pending a
+        # redraw we block until the next event instead of polling at FPS
+        if tree.dirty:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait()] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+
+            elif event.type == pygame.VIDEOEXPOSE:
+                # Window uncovered: the screen surface is intact, push all of it
+                pygame.display.flip()
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not tree.running and not tree.completed:
@@ -364,20 +478,18 @@ def main():
                     tree.goal_node = None
                     tree.reset_search()
 
-        # Drawing
-        screen.fill(BG_COLOR)
-        
-        # Draw Edges first (so they are behind nodes)
-        for node in tree.nodes:
-            node.draw(screen, font)
-            
-        # Draw Nodes
-        for node in tree.nodes:
-            node.draw_node_body(screen, font)
+        # Drawing (only when something changed)
+        if tree.dirty:
+            # Nodes whose state changed get a new image; the group then repaints
+            # just those areas from the edge layer (a full pass after a new tree)
+            tree.sprites.update(font)
+            dirty_rects = tree.sprites.draw(screen, tree.edge_surface)
+
+            dirty_rects.append(draw_sidebar(screen, font, small_font, msg_font, tree))
 
-        draw_sidebar(screen, font, tree)
+            pygame.display.update(dirty_rects)
+            tree.dirty = False
 
-        pygame.display.flip()
         clock.tick(FPS)
 
     pygame.quit()
@@ -20,56 +20,133 @@ COLOR_BETTER = (0, 200, 0)      # Green (Better neighbor found)
 COLOR_WORSE = (200, 0, 0)       # Red (Worse neighbor rejected)
 COLOR_PEAK = (255, 0, 255)      # Magenta (Local Max reached)
 
+# Node state -> body color (one lookup instead of an if/elif chain per frame)
+STATE_COLORS = {
+    'default': COLOR_DEFAULT,
+    'current': COLOR_CURRENT,
+    'neighbor': COLOR_NEIGHBOR,
+    'better': COLOR_BETTER,
+    'worse': COLOR_WORSE,
+    'peak': COLOR_PEAK
+}
+
+# --- Drawing Helpers ---
+# Pre-drawn node circles (fill + white border), keyed by (color, radius)
+# Cached surfaces are converted to the display format when built, so this
+# (like the other lazy caches) must only be filled after display.set_mode
+CIRCLE_CACHE = {}
+
+def get_circle(color, radius):
+    surf = CIRCLE_CACHE.get((color, radius))
+    if surf is None:
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(surf, color, (radius, radius), radius)
+        pygame.draw.circle(surf, (255, 255, 255), (radius, radius), radius, 2) # Border
+        CIRCLE_CACHE[(color, radius)] = surf
+    return surf
+
+def wrap_text(text, font, max_width):
+    """Greedy word wrap, measured in pixels with the font that renders it."""
+    lines = []
+    current_line = []
+    for word in text.split(' '):
+        current_line.append(word)
+        if len(current_line) > 1 and font.size(' '.join(current_line))[0] > max_width:
+            lines.append(' '.join(current_line[:-1]))
+            current_line = [word]
+    lines.append(' '.join(current_line))
+    return lines
+
 # --- Classes ---
 
-class Node:
+class Node(pygame.sprite.DirtySprite):
     def __init__(self, id, x, y):
+        super().__init__()
         self.id = id
         self.x = x
         self.y = y
         self.neighbors = []
         
+        # Cached text surfaces, rendered on first draw
+        self._id_surf_white = None
+        self._id_surf_black = None
+        self._score_surf = None
+
+        # Sprite: the image is rebuilt only when the state (or score) changes
+        self.image = None
+        self.rect = None
+        self._image_state = None
+
         # The "Value" or "Height" of this node (0 to 100)
         # In Hill Climbing, we want to maximize this.
         self.score = 0 
         
         self.state = 'default' # default, current, neighbor, better, worse, peak
 
-    def draw_edges(self, screen):
-        for neighbor in self.neighbors:
-            pygame.draw.line(screen, EDGE_COLOR, (self.x, self.y), (neighbor.x, neighbor.y), 2)
+    @property
+    def score(self):
+        return self._score
+
+    @score.setter
+    def score(self, value):
+        self._score = value
+        self._score_surf = None # Re-render the "H:" label on next draw
+        self._image_state = None
+
+    def update(self, font, small_font):
+        """Swaps in a new image (and marks the sprite dirty) if the state changed."""
+        if self._image_state == self.state:
+            return
 
-    def draw_body(self, screen, font, small_font):
         # Base color
-        color = COLOR_DEFAULT
-        if self.state == 'current': color = COLOR_CURRENT
-        elif self.state == 'neighbor': color = COLOR_NEIGHBOR
-        elif self.state == 'better': color = COLOR_BETTER
-        elif self.state == 'worse': color = COLOR_WORSE
-        elif self.state == 'peak': color = COLOR_PEAK
+        color = STATE_COLORS[self.state]
 
         # Size can slightly represent score for visual cue
-        radius = NODE_RADIUS + (self.score / 20) 
-
-        pygame.draw.circle(screen, color, (self.x, self.y), radius)
-        pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), radius, 2)
+        # (whole pixels only, so there are at most 6 cached sizes per color)
+        radius = NODE_RADIUS + self.score // 20
+        circle = get_circle(color, radius)
 
         # ID
-        text = font.render(str(self.id), True, (255,255,255) if color != COLOR_CURRENT else (0,0,0))
-        screen.blit(text, text.get_rect(center=(self.x, self.y - 10)))
+        if self._id_surf_white is None:
+            self._id_surf_white = font.render(str(self.id), True, (255,255,255)).convert_alpha()
+            self._id_surf_black = font.render(str(self.id), True, (0,0,0)).convert_alpha()
+        text = self._id_surf_white if color != COLOR_CURRENT else self._id_surf_black
         
         # Score (Elevation)
-        score_txt = small_font.render(f"H: {self.score}", True, (255, 255, 0))
-        screen.blit(score_txt, score_txt.get_rect(center=(self.x, self.y + 15)))
+        if self._score_surf is None:
+            self._score_surf = small_font.render(f"H: {self.score}", True, (255, 255, 0)).convert_alpha()
+        score_txt = self._score_surf
+
+        # The labels can poke out of the circle, so the sprite covers all three
+        circle_rect = circle.get_rect(center=(self.x, self.y))
+        text_rect = text.get_rect(center=(self.x, self.y - 10))
+        score_rect = score_txt.get_rect(center=(self.x, self.y + 15))
+        self.rect = circle_rect.unionall([text_rect, score_rect])
+
+        image = pygame.Surface(self.rect.size, pygame.SRCALPHA).convert_alpha()
+        image.blit(circle, circle_rect.move(-self.rect.x, -self.rect.y))
+        image.blit(text, text_rect.move(-self.rect.x, -self.rect.y))
+        image.blit(score_txt, score_rect.move(-self.rect.x, -self.rect.y))
+
+        self.image = image
+        self._image_state = self.state
+        self.dirty = 1
 
 class HillClimbingSim:
     def __init__(self):
         self.nodes = []
+        self.edge_polylines = [] # Grid edges traced as rows, columns and diagonals
+        # Background + static edges, rendered once per generated landscape
+        self.edge_surface = pygame.Surface((WIDTH - SIDEBAR_WIDTH, HEIGHT)).convert()
+        # Node sprites; drawing them over edge_surface redraws only changed areas
+        self.sprites = pygame.sprite.LayeredDirty()
         self.current_node = None
         self.message = "Click any node to Start Climbing."
         self.running = False
         self.completed = False
         self.best_neighbor = None
+        self._neighbors_highlighted = [] # Nodes recolored by the current climb step
+        self.dirty = True # Redraw needed (set by anything that changes the scene)
         
         # Step logic control
         self.step_stage = 0 
@@ -78,9 +155,21 @@ class HillClimbingSim:
         # 2: Evaluate Neighbors (Compare Scores)
         # 3: Move or Stop
 
+    @property
+    def message(self):
+        return self._message
+
+    @message.setter
+    def message(self, text):
+        self._message = text
+        self.message_surfs = None # Re-wrapped and rendered on next draw_sidebar
+        self.dirty = True
+
     def generate_landscape(self):
+        self.dirty = True
         self.nodes = []
         self.current_node = None
+        self._neighbors_highlighted = []
         self.running = False
         self.completed = False
         
@@ -110,27 +199,50 @@ class HillClimbingSim:
                 count += 1
         
         # Connect Neighbors (Grid adjacency + Diagonals)
+        # Each undirected edge is added once, from the cell that comes first in
+        # row-major order, so only the 4 "forward" directions are needed and no
+        # duplicate check is required. Neighbor lists still end up in row-major order.
         for r in range(rows):
             for c in range(cols):
                 node = grid[(r,c)]
-                # Look at 8 neighbors
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr==0 and dc==0: continue
-                        nr, nc = r+dr, c+dc
-                        if (nr, nc) in grid:
-                            neighbor = grid[(nr,nc)]
-                            # Add connection (undirected)
-                            if neighbor not in node.neighbors:
-                                node.neighbors.append(neighbor)
-                                neighbor.neighbors.append(node)
+                for dr, dc in [(0, 1), (1, -1), (1, 0), (1, 1)]:
+                    neighbor = grid.get((r+dr, c+dc))
+                    if neighbor is not None:
+                        # Add connection (undirected)
+                        node.neighbors.append(neighbor)
+                        neighbor.neighbors.append(node)
+
+        # Every grid edge lies on a row, a column or one of the two diagonals,
+        # so the whole graph draws with one polyline per line instead of one
+        # pygame call per edge
+        lines = [[(r, c) for c in range(cols)] for r in range(rows)]
+        lines += [[(r, c) for r in range(rows)] for c in range(cols)]
+        for d in range(-(rows - 1), cols): # Cells where c - r == d
+            lines.append([(r, r + d) for r in range(rows) if 0 <= r + d < cols])
+        for d in range(rows + cols - 1):   # Cells where r + c == d
+            lines.append([(r, d - r) for r in range(rows) if 0 <= d - r < cols])
+
+        self.edge_polylines = []
+        for cells in lines:
+            if len(cells) > 1:
+                self.edge_polylines.append([(grid[rc].x, grid[rc].y) for rc in cells])
+
+        self.edge_surface.fill(BG_COLOR)
+        for points in self.edge_polylines:
+            pygame.draw.lines(self.edge_surface, EDGE_COLOR, False, points, 2)
+
+        self.sprites = pygame.sprite.LayeredDirty(*self.nodes)
 
     def handle_click(self, pos):
         if self.running: return # Can't click while running
         x, y = pos
+        r2 = (NODE_RADIUS + 5) ** 2
         for node in self.nodes:
-            # Distance check
-            if ((x - node.x)**2 + (y - node.y)**2)**0.5 < NODE_RADIUS + 5:
+            # Distance check (squared, no sqrt)
+            dx = x - node.x
+            dy = y - node.y
+            if dx*dx + dy*dy < r2:
+                self.dirty = True
                 # Reset previous
                 for n in self.nodes: n.state = 'default'
                 
@@ -145,16 +257,18 @@ class HillClimbingSim:
     def step(self):
         if not self.running or self.completed or not self.current_node:
             return
+        self.dirty = True
 
         # --- Stage 1: Identify Neighbors ---
         if self.step_stage == 1:
             self.message = "Checking neighbors..."
-            # Reset colors
-            for n in self.nodes:
+            # Reset colors (only the last highlighted neighbors can be colored)
+            for n in self._neighbors_highlighted:
                 if n != self.current_node: n.state = 'default'
             
             # Highlight neighbors
             neighbors = self.current_node.neighbors
+            self._neighbors_highlighted = neighbors
             if not neighbors:
                 self.message = "No neighbors! Stuck."
                 self.current_node.state = 'peak'
@@ -172,18 +286,14 @@ class HillClimbingSim:
             neighbors = self.current_node.neighbors
             current_score = self.current_node.score
             
-            # Find the best neighbor
-            best = None
-            highest_score = -1
-
             for n in neighbors:
-                if n.score > current_score:
-                    n.state = 'better'
-                    if n.score > highest_score:
-                        highest_score = n.score
-                        best = n
-                else:
-                    n.state = 'worse' # Red if lower or equal (flat plateau is bad for simple hill climbing)
+                # Red if lower or equal (flat plateau is bad for simple hill climbing)
+                n.state = 'better' if n.score > current_score else 'worse'
+
+            # Find the best neighbor (max keeps the first of equal scores)
+            best = max(neighbors, key=lambda n: n.score)
+            if best.score <= current_score:
+                best = None
             
             self.best_neighbor = best
             
@@ -203,7 +313,7 @@ class HillClimbingSim:
                 self.current_node.state = 'current'
                 
                 # Reset others
-                for n in self.nodes:
+                for n in self._neighbors_highlighted:
                     if n != self.current_node: n.state = 'default'
                 
                 self.message = f"Moved to Node {self.current_node.id}. Press SPACE to continue."
@@ -222,74 +332,78 @@ class HillClimbingSim:
 
 
 # --- UI ---
-def draw_sidebar(screen, font, small_font, sim):
-    rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, SIDEBAR_BG, rect)
-    pygame.draw.line(screen, (100,100,100), (WIDTH - SIDEBAR_WIDTH, 0), (WIDTH - SIDEBAR_WIDTH, HEIGHT), 2)
+LEGEND_DATA = [
+    ("Current Position", COLOR_CURRENT),
+    ("Higher Neighbor (Good)", COLOR_BETTER),
+    ("Lower/Equal (Bad)", COLOR_WORSE),
+    ("Local Maximum (Stuck)", COLOR_PEAK)
+]
+EXPLANATION = [
+    "Algorithm Logic:",
+    "1. Look at immediate neighbors.",
+    "2. If a neighbor is HIGHER,",
+    "   move to the highest one.",
+    "3. If all neighbors are LOWER,",
+    "   STOP.",
+    "",
+    "Note: This does not backtrack!",
+    "It can get stuck on small hills."
+]
+SIDEBAR_STATIC = None # Everything but the stats and message; built on first draw_sidebar call
+
+def build_sidebar_static(font, small_font):
+    """Renders the parts of the sidebar that never change onto one surface."""
+    surf = pygame.Surface((SIDEBAR_WIDTH, HEIGHT)).convert()
+    surf.fill(SIDEBAR_BG)
+    pygame.draw.line(surf, (100,100,100), (0, 0), (0, HEIGHT), 2)
 
     title = font.render("Hill Climbing Search", True, (255, 255, 255))
-    screen.blit(title, (WIDTH - SIDEBAR_WIDTH + 20, 20))
+    surf.blit(title, (20, 20))
     
     # Legend
     y_off = 80
-    legend_data = [
-        ("Current Position", COLOR_CURRENT),
-        ("Higher Neighbor (Good)", COLOR_BETTER),
-        ("Lower/Equal (Bad)", COLOR_WORSE),
-        ("Local Maximum (Stuck)", COLOR_PEAK)
-    ]
-    for txt, col in legend_data:
-        pygame.draw.circle(screen, col, (WIDTH - SIDEBAR_WIDTH + 30, y_off+10), 8)
-        screen.blit(small_font.render(txt, True, TEXT_COLOR), (WIDTH - SIDEBAR_WIDTH + 50, y_off))
+    for txt, col in LEGEND_DATA:
+        pygame.draw.circle(surf, col, (30, y_off+10), 8)
+        surf.blit(small_font.render(txt, True, TEXT_COLOR), (50, y_off))
         y_off += 30
 
-    y_off += 30
-    
+    # Explanation Text (below the Current Stats line)
+    y_off += 30 + 50
+    for line in EXPLANATION:
+        l_surf = small_font.render(line, True, (180, 180, 180))
+        surf.blit(l_surf, (20, y_off))
+        y_off += 25
+
+    # Status Bar background
+    pygame.draw.rect(surf, (20,20,20), (10, HEIGHT - 100, SIDEBAR_WIDTH-20, 80))
+
+    controls = small_font.render("Space: Step | R: Restart | N: New Map", True, (150,150,150))
+    surf.blit(controls, (20, HEIGHT-30))
+    return surf
+
+def draw_sidebar(screen, font, small_font, sim):
+    global SIDEBAR_STATIC
+    if SIDEBAR_STATIC is None:
+        SIDEBAR_STATIC = build_sidebar_static(font, small_font)
+    rect = screen.blit(SIDEBAR_STATIC, (WIDTH - SIDEBAR_WIDTH, 0))
+
     # Current Stats
+    y_off = 80 + 30 * len(LEGEND_DATA) + 30 # Below the legend
     if sim.current_node:
         txt_curr = font.render(f"Current Height: {sim.current_node.score}", True, COLOR_CURRENT)
         screen.blit(txt_curr, (WIDTH - SIDEBAR_WIDTH + 20, y_off))
-    
-    # Explanation Text
-    y_off += 50
-    explanation = [
-        "Algorithm Logic:",
-        "1. Look at immediate neighbors.",
-        "2. If a neighbor is HIGHER,",
-        "   move to the highest one.",
-        "3. If all neighbors are LOWER,",
-        "   STOP.",
-        "",
-        "Note: This does not backtrack!",
-        "It can get stuck on small hills."
-    ]
-    
-    for line in explanation:
-        l_surf = small_font.render(line, True, (180, 180, 180))
-        screen.blit(l_surf, (WIDTH - SIDEBAR_WIDTH + 20, y_off))
-        y_off += 25
 
     # Status Bar
     status_y = HEIGHT - 100
-    pygame.draw.rect(screen, (20,20,20), (WIDTH-SIDEBAR_WIDTH+10, status_y, SIDEBAR_WIDTH-20, 80))
     
-    # Word wrap message
-    words = sim.message.split(' ')
-    lines = []
-    curr = []
-    for w in words:
-        curr.append(w)
-        if len(' '.join(curr)) > 30:
-            lines.append(' '.join(curr[:-1]))
-            curr = [w]
-    lines.append(' '.join(curr))
+    # Word wrap message (only when the message changed)
+    if sim.message_surfs is None:
+        lines = wrap_text(sim.message, small_font, SIDEBAR_WIDTH - 40)
+        sim.message_surfs = [small_font.render(ln, True, COLOR_CURRENT).convert_alpha() for ln in lines]
     
-    for i, ln in enumerate(lines):
-        msg_surf = small_font.render(ln, True, COLOR_CURRENT)
+    for i, msg_surf in enumerate(sim.message_surfs):
         screen.blit(msg_surf, (WIDTH-SIDEBAR_WIDTH+20, status_y+10 + i*20))
-        
-    controls = small_font.render("Space: Step | R: Restart | N: New Map", True, (150,150,150))
-    screen.blit(controls, (WIDTH-SIDEBAR_WIDTH+20, HEIGHT-30))
+    return rect # Area that changed, for pygame.display.update
 
 def main():
     pygame.init()
@@ -304,8 +418,16 @@ def main():
 
     running = True
     while running:
-        for event in pygame.event.get():
+        # The scene only changes on user input, so when nothing is pending a
+        # redraw we block until the next event instead of polling at FPS
+        if sim.dirty:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait()] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT: running = False
+            elif event.type == pygame.VIDEOEXPOSE: pygame.display.flip() # Screen surface is intact
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 sim.handle_click(pygame.mouse.get_pos())
             elif event.type == pygame.KEYDOWN:
@@ -320,16 +442,16 @@ def main():
                 elif event.key == pygame.K_n:
                     sim.generate_landscape()
 
-        screen.fill(BG_COLOR)
-        
-        # Draw edges first
-        for node in sim.nodes: node.draw_edges(screen)
-        # Draw nodes
-        for node in sim.nodes: node.draw_body(screen, font, small_font)
-        
-        draw_sidebar(screen, font, small_font, sim)
-        
-        pygame.display.flip()
+        if sim.dirty:
+            # Nodes whose state changed get a new image; the group then repaints
+            # just those areas from the edge layer (a full pass after a new map)
+            sim.sprites.update(font, small_font)
+            dirty_rects = sim.sprites.draw(screen, sim.edge_surface)
+            
+            dirty_rects.append(draw_sidebar(screen, font, small_font, sim))
+            
+            pygame.display.update(dirty_rects)
+            sim.dirty = False
         clock.tick(FPS)
     pygame.quit()
 
@@ -1,6 +1,8 @@
 import pygame
 import random
 import math
+import heapq
+import itertools
 
 # --- Constants ---
 WIDTH, HEIGHT = 1200, 800
@@ -20,9 +22,32 @@ COLOR_CURRENT = (0, 255, 255)
 COLOR_FRONTIER = (255, 200, 0)
 COLOR_VISITED = (0, 100, 200)
 COLOR_PATH = (0, 255, 0)
+COLOR_UNVISITED = (80, 80, 80)
+
+# Display states, in increasing priority; a node's state_id indexes COLOR_TABLE
+STATE_UNVISITED, STATE_FRONTIER, STATE_VISITED, STATE_START, STATE_GOAL, STATE_CURRENT, STATE_PATH = range(7)
+COLOR_TABLE = (COLOR_UNVISITED, COLOR_FRONTIER, COLOR_VISITED, COLOR_START, COLOR_GOAL, COLOR_CURRENT, COLOR_PATH)
+
+# --- Drawing Helpers ---
+
+# Rendered edge weight labels, keyed by weight (weights are small integers)
+# Converted to the display format, so only fill after display.set_mode
+WEIGHT_CACHE = {}
+
+def get_weight_surf(font, weight):
+    surf = WEIGHT_CACHE.get(weight)
+    if surf is None:
+        surf = font.render(str(weight), True, (255, 255, 0)).convert_alpha()
+        WEIGHT_CACHE[weight] = surf
+    return surf
 
 # --- Classes ---
 class Node:
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = ('id', 'x', 'y', 'edges', 'parent', 'g', 'h', 'f', 'state', 'state_id',
+                 'is_start', 'is_goal', 'is_current', 'in_final_path',
+                 '_id_surf_white', '_id_surf_black', '_metrics', '_f_surf', '_gh_surf')
+
     def __init__(self, id, x, y):
         self.id = id
         self.x = x
@@ -32,7 +57,7 @@ class Node:
         
         # A* Metrics
         self.g = float('inf') # Cost from start
-        self.h = 0            # Heuristic to goal
+        self.h = None         # Heuristic to goal (worked out on first use)
         self.f = float('inf') # Total estimated cost (g+h)
         
         self.state = 'unvisited' 
@@ -40,75 +65,95 @@ class Node:
         self.is_goal = False
         self.is_current = False
         self.in_final_path = False
+        self.state_id = STATE_UNVISITED # Cached display state, see update_state_id
+
+        # Cached text, rendered on first draw (white normally, black on cyan)
+        self._id_surf_white = None
+        self._id_surf_black = None
+        self._metrics = None # (f, g, h) the detail labels were rendered for
+        self._f_surf = None
+        self._gh_surf = None
 
     def reset(self):
         self.state = 'unvisited'
         self.parent = None
         self.g = float('inf')
-        self.h = 0
+        self.h = None
         self.f = float('inf')
         self.is_current = False
         self.in_final_path = False
+        self.update_state_id()
+
+    def update_state_id(self):
+        """Resolves the flags into one display state. Call after changing any of them."""
+        if self.in_final_path: self.state_id = STATE_PATH
+        elif self.is_current: self.state_id = STATE_CURRENT
+        elif self.is_start: self.state_id = STATE_START
+        elif self.is_goal: self.state_id = STATE_GOAL
+        elif self.state == 'frontier': self.state_id = STATE_FRONTIER
+        elif self.state == 'visited': self.state_id = STATE_VISITED
+        else: self.state_id = STATE_UNVISITED
 
     def calculate_heuristic(self, goal_node):
         # Euclidean distance, scaled down to match edge weights roughly
-        dist = math.sqrt((self.x - goal_node.x)**2 + (self.y - goal_node.y)**2)
+        # Squared distance would skip the hypot but grows with distance squared,
+        # so h would swamp g (greedy best-first, not A*) and could not stay
+        # consistent (h(n) <= cost(n, m) + h(m)) for any single scale
+        dist = math.hypot(self.x - goal_node.x, self.y - goal_node.y)
         self.h = round(dist / 15.0, 1) # Scaling factor for visual balance
 
-    def draw_edges(self, screen, font):
-        for child, weight in self.edges:
-            color = EDGE_COLOR
-            width = 2
-            if self.in_final_path and child.in_final_path and (child.parent == self or self.parent == child):
-                color = COLOR_PATH
-                width = 5
-
-            pygame.draw.line(screen, color, (self.x, self.y), (child.x, child.y), width)
-            
-            mid_x = (self.x + child.x) / 2
-            mid_y = (self.y + child.y) / 2
-            weight_surf = font.render(str(weight), True, (255, 255, 0))
-            rect = weight_surf.get_rect(center=(mid_x, mid_y))
-            pygame.draw.rect(screen, BG_COLOR, rect.inflate(4, 4))
-            screen.blit(weight_surf, rect)
-
     def draw_body(self, screen, font, detail_font):
-        color = (80, 80, 80)
-        if self.in_final_path: color = COLOR_PATH
-        elif self.is_current: color = COLOR_CURRENT
-        elif self.is_start: color = COLOR_START
-        elif self.is_goal: color = COLOR_GOAL
-        elif self.state == 'frontier': color = COLOR_FRONTIER
-        elif self.state == 'visited': color = COLOR_VISITED
+        color = COLOR_TABLE[self.state_id]
 
         pygame.draw.circle(screen, color, (self.x, self.y), NODE_RADIUS)
         pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), NODE_RADIUS, 2)
         
         # ID
-        text = font.render(str(self.id), True, (255,255,255) if color != COLOR_CURRENT else (0,0,0))
+        if self._id_surf_white is None:
+            self._id_surf_white = font.render(str(self.id), True, (255,255,255)).convert_alpha()
+            self._id_surf_black = font.render(str(self.id), True, (0,0,0)).convert_alpha()
+        text = self._id_surf_white if self.state_id != STATE_CURRENT else self._id_surf_black
         screen.blit(text, text.get_rect(center=(self.x, self.y)))
 
         # Draw F, G, H if visited or frontier
         if self.state in ['frontier', 'visited'] or self.is_current:
+            # Re-render only when the numbers change
+            if self._metrics != (self.f, self.g, self.h):
+                self._metrics = (self.f, self.g, self.h)
+                self._f_surf = detail_font.render(f"F:{self.f:.1f}", True, (0, 255, 255)).convert_alpha()
+                self._gh_surf = detail_font.render(f"g:{self.g:.1f} h:{self.h:.1f}", True, (200, 200, 200)).convert_alpha()
             # F on top
-            f_txt = detail_font.render(f"F:{self.f:.1f}", True, (0, 255, 255))
-            screen.blit(f_txt, (self.x - 25, self.y - 45))
+            screen.blit(self._f_surf, (self.x - 25, self.y - 45))
             # G and H below
-            gh_txt = detail_font.render(f"g:{self.g:.1f} h:{self.h:.1f}", True, (200, 200, 200))
-            screen.blit(gh_txt, (self.x - 35, self.y + 30))
+            screen.blit(self._gh_surf, (self.x - 35, self.y + 30))
 
 
 class SearchTree:
     def __init__(self):
         self.nodes = []
-        self.open_list = [] # The Priority Queue
+        self.open_list = [] # The Priority Queue: heap of (f, insertion order, node)
+        self._counter = itertools.count() # Tie-breaker, so equal F pops first-in first
+        self._current_ref = None # Node highlighted as 'current' by the last step
         self.start_node = None
         self.goal_node = None
+
+        # Edge geometry as polylines, so each draws with one pygame call
+        self.edge_points = []
+        self.path_points = []
+        self.edge_labels = [] # (weight, midpoint) for every edge
+
         self.running = False
         self.completed = False
         self.message = "L-Click: Start | R-Click: Goal"
+        self.dirty = True # Redraw needed (set by anything that changes the scene)
+
+    def _h(self, node):
+        # Heuristics are only needed for nodes the search reaches, so compute lazily
+        if node.h is None: node.calculate_heuristic(self.goal_node)
+        return node.h
 
     def generate_tree(self):
+        self.dirty = True
         # (Similar generation to UCS)
         self.nodes = []
         root = Node(0, (WIDTH - SIDEBAR_WIDTH) // 2, 80)
@@ -129,14 +174,55 @@ class SearchTree:
                 child = Node(count, int(child_x), int(child_y))
                 weight = random.randint(1, 5) # Smaller weights for A* demo
                 self.nodes.append(child)
-                parent.edges.append((child, weight))
+                # Label position is fixed once placed, so store it with the edge
+                midpoint = ((parent.x + child.x) // 2, (parent.y + child.y) // 2)
+                parent.edges.append((child, weight, midpoint))
                 gen_queue.append((child, x_min + span * i, x_min + span * (i+1), depth + 1))
                 count += 1
 
+        self.build_edge_points()
+
+    def build_edge_points(self):
+        """Walks the tree depth-first so a single polyline traces every edge."""
+        root = self.nodes[0]
+        self.edge_points = [(root.x, root.y)]
+        self.edge_labels = []
+        stack = [(root, iter(root.edges))]
+        while stack:
+            node, edges = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                if stack: # Walk back up to the parent
+                    self.edge_points.append((stack[-1][0].x, stack[-1][0].y))
+            else:
+                child, weight, midpoint = edge
+                self.edge_points.append((child.x, child.y))
+                self.edge_labels.append((weight, midpoint))
+                stack.append((child, iter(child.edges)))
+
+    def draw_edges(self, screen, font):
+        if len(self.edge_points) > 1:
+            pygame.draw.lines(screen, EDGE_COLOR, False, self.edge_points, 2)
+        # The final path is a single chain, so it is one polyline as well
+        if len(self.path_points) > 1:
+            pygame.draw.lines(screen, COLOR_PATH, False, self.path_points, 5)
+
+        # Weight labels on top, with a background box for readability
+        for weight, midpoint in self.edge_labels:
+            weight_surf = get_weight_surf(font, weight)
+            rect = weight_surf.get_rect(center=midpoint)
+            pygame.draw.rect(screen, BG_COLOR, rect.inflate(4, 4))
+            screen.blit(weight_surf, rect)
+
     def handle_click(self, pos, button):
         x, y = pos
+        r2 = NODE_RADIUS * NODE_RADIUS
+        # Compare squared distances, no sqrt
         for node in self.nodes:
-            if ((x - node.x)**2 + (y - node.y)**2)**0.5 < NODE_RADIUS:
+            dx = x - node.x
+            dy = y - node.y
+            if dx*dx + dy*dy < r2:
                 if button == 1:
                     if self.start_node: self.start_node.is_start = False
                     node.is_start = True
@@ -149,26 +235,27 @@ class SearchTree:
                 return
 
     def reset_search(self):
+        self.dirty = True
         self.open_list = []
+        self._current_ref = None
         self.running = False
         self.completed = False
         self.message = "Press SPACE to Step"
+        self.path_points = []
         for node in self.nodes:
             node.reset()
         
         if self.start_node and self.goal_node:
-            # 1. Calculate Heuristics for ALL nodes first
-            for n in self.nodes:
-                n.calculate_heuristic(self.goal_node)
-            
-            # 2. Init Start Node
+            # Init Start Node
             self.start_node.g = 0
-            self.start_node.f = self.start_node.g + self.start_node.h
-            self.open_list.append(self.start_node)
+            self.start_node.f = self.start_node.g + self._h(self.start_node)
+            heapq.heappush(self.open_list, (self.start_node.f, next(self._counter), self.start_node))
             self.start_node.state = 'frontier'
-            self.message = "Heuristics calculated. Open List Init. Press SPACE."
+            self.start_node.update_state_id()
+            self.message = "Ready. Open List Init. Press SPACE."
 
     def step(self):
+        self.dirty = True
         if not self.running and not self.completed: self.running = True
         if self.completed or not self.open_list:
              if not self.open_list and not self.completed: self.message = "No Path Found."
@@ -176,12 +263,24 @@ class SearchTree:
              return
 
         # 1. Pop node with Lowest F Score
-        self.open_list.sort(key=lambda n: n.f)
-        current = self.open_list.pop(0)
+        # Entries are never updated in place: a better F pushes a new entry and
+        # the old one is skipped here when it comes out (lazy deletion)
+        while self.open_list:
+            f, _, current = heapq.heappop(self.open_list)
+            if current.state == 'frontier' and f == current.f:
+                break
+        else:
+            self.message = "No Path Found."
+            self.completed = True
+            return
 
-        for n in self.nodes: n.is_current = False
+        if self._current_ref is not None:
+            self._current_ref.is_current = False
+            self._current_ref.update_state_id()
         current.is_current = True
+        self._current_ref = current
         current.state = 'visited'
+        current.update_state_id()
 
         # 2. Check Goal
         if current == self.goal_node:
@@ -191,60 +290,74 @@ class SearchTree:
             return
 
         # 3. Expand Neighbors
+        # Loop-invariant lookups bound to locals once
+        open_list, counter, heuristic, heappush = self.open_list, self._counter, self._h, heapq.heappush
+        current_g = current.g
         updates = 0
-        for child, weight in current.edges:
-            tentative_g = current.g + weight
+        for child, weight, _ in current.edges:
+            tentative_g = current_g + weight
             
             if tentative_g < child.g:
-                # Found a better path to child
+                # Found a better path to child: push it with the new F. Any
+                # older entry for it goes stale and is skipped when popped
                 child.parent = current
                 child.g = tentative_g
-                child.f = child.g + child.h
-                
-                if child.state == 'unvisited':
-                    child.state = 'frontier'
-                    self.open_list.append(child)
-                    updates += 1
-                elif child.state == 'frontier':
-                     # It's already in open list, but we updated its F, need resort later
-                     updates += 1
-                     pass
+                child.f = f = tentative_g + heuristic(child)
+                child.state = 'frontier'
+                child.update_state_id()
+                heappush(open_list, (f, next(counter), child))
+                updates += 1
         
-        self.open_list.sort(key=lambda n: n.f) # Ensure sorted for UI
         self.message = f"Expanded Node {current.id} (F:{current.f:.1f}). Updated {updates} neighbors."
 
     def reconstruct_path(self, current):
         temp = current
         while temp:
             temp.in_final_path = True
+            temp.update_state_id()
+            self.path_points.append((temp.x, temp.y))
             temp = temp.parent
 
 # --- UI ---
-def draw_sidebar(screen, font, small_font, tree):
-    rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, SIDEBAR_BG, rect)
-    pygame.draw.line(screen, (100,100,100), (WIDTH - SIDEBAR_WIDTH, 0), (WIDTH - SIDEBAR_WIDTH, HEIGHT), 2)
+LEGEND_ITEMS = [("Start", COLOR_START), ("Goal", COLOR_GOAL), ("Open List", COLOR_FRONTIER)]
+SIDEBAR_STATIC = None # Background, headings, legend and controls; built on first draw_sidebar call
+
+def build_sidebar_static(font, small_font):
+    """Renders the parts of the sidebar that never change onto one surface."""
+    surf = pygame.Surface((SIDEBAR_WIDTH, HEIGHT)).convert()
+    surf.fill(SIDEBAR_BG)
+    pygame.draw.line(surf, (100,100,100), (0, 0), (0, HEIGHT), 2)
 
-    title = font.render("A* Search Simulation", True, (255, 255, 255))
-    screen.blit(title, (WIDTH - SIDEBAR_WIDTH + 20, 20))
-    sub = small_font.render("f(n) = g(n) + h(n)", True, COLOR_CURRENT)
-    screen.blit(sub, (WIDTH - SIDEBAR_WIDTH + 20, 55))
+    surf.blit(font.render("A* Search Simulation", True, (255, 255, 255)), (20, 20))
+    surf.blit(small_font.render("f(n) = g(n) + h(n)", True, COLOR_CURRENT), (20, 55))
 
     # Legend (Simplified)
     y_off = 100
-    legend = [("Start", COLOR_START), ("Goal", COLOR_GOAL), ("Open List", COLOR_FRONTIER)]
-    for txt, col in legend:
-        pygame.draw.circle(screen, col, (WIDTH - SIDEBAR_WIDTH + 30, y_off+10), 8)
-        screen.blit(small_font.render(txt, True, TEXT_COLOR), (WIDTH - SIDEBAR_WIDTH + 50, y_off))
+    for txt, col in LEGEND_ITEMS:
+        pygame.draw.circle(surf, col, (30, y_off+10), 8)
+        surf.blit(small_font.render(txt, True, TEXT_COLOR), (50, y_off))
         y_off += 30
 
-    # Priority Queue
+    # Priority Queue heading
     y_off += 20
-    screen.blit(font.render("Open List (Sorted by F)", True, (255, 255, 255)), (WIDTH - SIDEBAR_WIDTH + 20, y_off))
-    y_off += 40
+    surf.blit(font.render("Open List (Sorted by F)", True, (255, 255, 255)), (20, y_off))
+
+    # Status box and controls
+    pygame.draw.rect(surf, (20,20,20), (10, HEIGHT - 150, SIDEBAR_WIDTH-20, 60))
+    surf.blit(small_font.render("Space: Step | R: Reset | N: New Tree", True, (150,150,150)), (20, HEIGHT-50))
+    return surf
+
+def draw_sidebar(screen, font, small_font, tree):
+    global SIDEBAR_STATIC
+    if SIDEBAR_STATIC is None: SIDEBAR_STATIC = build_sidebar_static(font, small_font)
+    screen.blit(SIDEBAR_STATIC, (WIDTH - SIDEBAR_WIDTH, 0))
+
+    # Priority Queue
+    y_off = 100 + 30 * len(LEGEND_ITEMS) + 20 + 40 # Below the legend and heading
     
-    for i, node in enumerate(tree.open_list):
-        if i > 10: break
+    # Only the 11 shown rows are pulled out of the heap (stale entries skipped)
+    live = (entry for entry in tree.open_list if entry[2].state == 'frontier' and entry[0] == entry[2].f)
+    for _, _, node in heapq.nsmallest(11, live):
         pygame.draw.rect(screen, (60,60,60), (WIDTH - SIDEBAR_WIDTH + 10, y_off, SIDEBAR_WIDTH - 20, 30))
         txt = small_font.render(f"ID:{node.id} | F:{node.f:.1f} (g:{node.g:.1f}+h:{node.h:.1f})", True, COLOR_FRONTIER)
         screen.blit(txt, (WIDTH - SIDEBAR_WIDTH + 20, y_off + 5))
@@ -252,9 +365,7 @@ def draw_sidebar(screen, font, small_font, tree):
 
     # Status
     y_off = HEIGHT - 150
-    pygame.draw.rect(screen, (20,20,20), (WIDTH-SIDEBAR_WIDTH+10, y_off, SIDEBAR_WIDTH-20, 60))
     screen.blit(small_font.render(tree.message, True, COLOR_CURRENT), (WIDTH-SIDEBAR_WIDTH+20, y_off+20))
-    screen.blit(small_font.render("Space: Step | R: Reset | N: New Tree", True, (150,150,150)), (WIDTH-SIDEBAR_WIDTH+20, HEIGHT-50))
 
 def main():
     pygame.init()
@@ -270,8 +381,14 @@ def main():
 
     running = True
     while running:
-        for event in pygame.event.get():
+        # The scene only changes on user input, so when nothing is pending a
+        # redraw we block until the next event instead of polling at FPS
+        if tree.dirty: events = pygame.event.get()
+        else: events = [pygame.event.wait()] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT: running = False
+            elif event.type == pygame.VIDEOEXPOSE: tree.dirty = True
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not tree.running: tree.handle_click(pygame.mouse.get_pos(), event.button)
             elif event.type == pygame.KEYDOWN:
@@ -283,11 +400,14 @@ def main():
                     tree.goal_node = None
                     tree.reset_search()
 
-        screen.fill(BG_COLOR)
-        for node in tree.nodes: node.draw_edges(screen, font)
-        for node in tree.nodes: node.draw_body(screen, font, detail_font)
-        draw_sidebar(screen, font, small_font, tree)
-        pygame.display.flip()
+        # Drawing (only when something changed)
+        if tree.dirty:
+            screen.fill(BG_COLOR)
+            tree.draw_edges(screen, font)
+            for node in tree.nodes: node.draw_body(screen, font, detail_font)
+            draw_sidebar(screen, font, small_font, tree)
+            pygame.display.flip()
+            tree.dirty = False
         clock.tick(FPS)
     pygame.quit()
 
@@ -1,5 +1,7 @@
 import pygame
 import random
+import heapq
+import itertools
 
 # --- Constants & Configuration ---
 WIDTH, HEIGHT = 1200, 800
@@ -22,14 +24,48 @@ COLOR_FRONTIER = (255, 200, 0)  # Yellow (In Priority Queue)
 COLOR_VISITED = (0, 100, 200)   # Blue (Done)
 COLOR_PATH = (0, 255, 0)        # Bright Green
 
+# Display states, in increasing priority; a node's state_id indexes COLOR_TABLE
+STATE_UNVISITED, STATE_FRONTIER, STATE_VISITED, STATE_START, STATE_GOAL, STATE_CURRENT, STATE_PATH = range(7)
+COLOR_TABLE = (COLOR_UNVISITED, COLOR_FRONTIER, COLOR_VISITED, COLOR_START, COLOR_GOAL, COLOR_CURRENT, COLOR_PATH)
+
+# --- Drawing Helpers ---
+
+# Rendered edge weight labels, keyed by weight (weights are small integers)
+# Converted to the display format, so only fill after display.set_mode
+WEIGHT_CACHE = {}
+
+def get_weight_surf(font, weight):
+    surf = WEIGHT_CACHE.get(weight)
+    if surf is None:
+        surf = font.render(str(weight), True, (255, 255, 0)).convert_alpha()
+        WEIGHT_CACHE[weight] = surf
+    return surf
+
+def wrap_text(text, font, max_width):
+    """Greedy word wrap, measured in pixels with the font that renders it."""
+    lines = []
+    current_line = []
+    for word in text.split(' '):
+        current_line.append(word)
+        if len(current_line) > 1 and font.size(' '.join(current_line))[0] > max_width:
+            lines.append(' '.join(current_line[:-1]))
+            current_line = [word]
+    lines.append(' '.join(current_line))
+    return lines
+
 # --- Classes ---
 
 class Node:
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = ('id', 'x', 'y', 'edges', 'parent', 'g_cost', 'state', 'state_id',
+                 'is_start', 'is_goal', 'is_current', 'in_final_path',
+                 '_id_surf_white', '_id_surf_black', '_cost_surf_for', '_cost_surf')
+
     def __init__(self, id, x, y):
         self.id = id
         self.x = x
         self.y = y
-        self.edges = []  # List of tuples: (child_node, weight)
+        self.edges = []  # List of tuples: (child_node, weight, label midpoint)
         self.parent = None
         
         # UCS Specific Attributes
@@ -41,6 +77,13 @@ class Node:
         self.is_goal = False
         self.is_current = False
         self.in_final_path = False
+        self.state_id = STATE_UNVISITED # Cached display state, see update_state_id
+
+        # Cached text, rendered on first draw (white normally, black on cyan)
+        self._id_surf_white = None
+        self._id_surf_black = None
+        self._cost_surf_for = None # g_cost the cost label was rendered for
+        self._cost_surf = None
 
     def reset(self):
         self.state = 'unvisited'
@@ -48,68 +91,70 @@ class Node:
         self.g_cost = float('inf')
         self.is_current = False
         self.in_final_path = False
-
-    def draw_edges(self, screen, font):
-        for child, weight in self.edges:
-            # Line Style
-            color = EDGE_COLOR
-            width = 2
-            
-            # Highlight path
-            if self.in_final_path and child.in_final_path and child.parent == self:
-                color = COLOR_PATH
-                width = 5
-            elif self.in_final_path and child.in_final_path and self.parent == child:
-                # This handles the parent pointer visual for the reverse path
-                color = COLOR_PATH
-                width = 5
-
-            pygame.draw.line(screen, color, (self.x, self.y), (child.x, child.y), width)
-            
-            # Draw Weight Text (midpoint)
-            mid_x = (self.x + child.x) / 2
-            mid_y = (self.y + child.y) / 2
-            
-            # Weight box background for readability
-            weight_surf = font.render(str(weight), True, (255, 255, 0))
-            rect = weight_surf.get_rect(center=(mid_x, mid_y))
-            pygame.draw.rect(screen, BG_COLOR, rect.inflate(4, 4))
-            screen.blit(weight_surf, rect)
+        self.update_state_id()
+
+    def update_state_id(self):
+        """Resolves the flags into one display state. Call after changing any of them."""
+        if self.in_final_path: self.state_id = STATE_PATH
+        elif self.is_current: self.state_id = STATE_CURRENT
+        elif self.is_start: self.state_id = STATE_START
+        elif self.is_goal: self.state_id = STATE_GOAL
+        elif self.state == 'frontier': self.state_id = STATE_FRONTIER
+        elif self.state == 'visited': self.state_id = STATE_VISITED
+        else: self.state_id = STATE_UNVISITED
 
     def draw_body(self, screen, font, small_font):
-        color = COLOR_UNVISITED
-        if self.in_final_path: color = COLOR_PATH
-        elif self.is_current: color = COLOR_CURRENT
-        elif self.is_start: color = COLOR_START
-        elif self.is_goal: color = COLOR_GOAL
-        elif self.state == 'frontier': color = COLOR_FRONTIER
-        elif self.state == 'visited': color = COLOR_VISITED
+        color = COLOR_TABLE[self.state_id]
 
         pygame.draw.circle(screen, color, (self.x, self.y), NODE_RADIUS)
         pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), NODE_RADIUS, 2)
         
         # Draw ID (Center)
-        text = font.render(str(self.id), True, (255,255,255) if color != COLOR_CURRENT else (0,0,0))
+        if self._id_surf_white is None:
+            self._id_surf_white = font.render(str(self.id), True, (255,255,255)).convert_alpha()
+            self._id_surf_black = font.render(str(self.id), True, (0,0,0)).convert_alpha()
+        text = self._id_surf_white if self.state_id != STATE_CURRENT else self._id_surf_black
         text_rect = text.get_rect(center=(self.x, self.y))
         screen.blit(text, text_rect)
 
         # Draw Current Cost g(n) (Top Right of node)
         if self.g_cost != float('inf'):
-            cost_text = small_font.render(f"g:{self.g_cost}", True, (0, 255, 255))
-            screen.blit(cost_text, (self.x + 10, self.y - 30))
+            if self._cost_surf_for != self.g_cost:
+                self._cost_surf = small_font.render(f"g:{self.g_cost}", True, (0, 255, 255)).convert_alpha()
+                self._cost_surf_for = self.g_cost
+            screen.blit(self._cost_surf, (self.x + 10, self.y - 30))
 
 class SearchTree:
     def __init__(self):
         self.nodes = []
-        self.priority_queue = [] # List of nodes, sorted by g_cost
+        self.priority_queue = [] # Heap of (g_cost, insertion order, node)
+        self._counter = itertools.count() # Tie-breaker, so equal costs pop first-in first
+        self._current_ref = None # Node highlighted as 'current' by the last step
         self.start_node = None
         self.goal_node = None
+
+        # Edge geometry as polylines, so each draws with one pygame call
+        self.edge_points = []
+        self.path_points = []
+        self.edge_labels = [] # (weight, midpoint) for every edge
         
         self.running = False
         self.completed = False
         self.message = "L-Click: Start | R-Click: Goal"
+        self.dirty = True # Redraw needed (set by anything that changes the scene)
+
+    @property
+    def message(self):
+        return self._message
+
+    @message.setter
+    def message(self, text):
+        self._message = text
+        self.message_surfs = None # Re-wrapped and rendered on next draw_sidebar
+        self.dirty = True
 
     def generate_tree(self):
+        self.dirty = True
         self.nodes = []
         root = Node(0, (WIDTH - SIDEBAR_WIDTH) // 2, 80)
         self.nodes.append(root)
@@ -140,15 +185,56 @@ class SearchTree:
                 weight = random.randint(1, 9)
                 
                 self.nodes.append(child)
-                parent.edges.append((child, weight))
+                # Label position is fixed once placed, so store it with the edge
+                midpoint = ((parent.x + child.x) // 2, (parent.y + child.y) // 2)
+                parent.edges.append((child, weight, midpoint))
                 
                 gen_queue.append((child, x_min + span * i, x_min + span * (i+1), depth + 1))
                 count += 1
 
+        self.build_edge_points()
+
+    def build_edge_points(self):
+        """Walks the tree depth-first so a single polyline traces every edge."""
+        root = self.nodes[0]
+        self.edge_points = [(root.x, root.y)]
+        self.edge_labels = []
+        stack = [(root, iter(root.edges))]
+        while stack:
+            node, edges = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                if stack: # Walk back up to the parent
+                    self.edge_points.append((stack[-1][0].x, stack[-1][0].y))
+            else:
+                child, weight, midpoint = edge
+                self.edge_points.append((child.x, child.y))
+                self.edge_labels.append((weight, midpoint))
+                stack.append((child, iter(child.edges)))
+
+    def draw_edges(self, screen, font):
+        if len(self.edge_points) > 1:
+            pygame.draw.lines(screen, EDGE_COLOR, False, self.edge_points, 2)
+        # The final path is a single chain, so it is one polyline as well
+        if len(self.path_points) > 1:
+            pygame.draw.lines(screen, COLOR_PATH, False, self.path_points, 5)
+
+        # Weight labels on top, with a background box for readability
+        for weight, midpoint in self.edge_labels:
+            weight_surf = get_weight_surf(font, weight)
+            rect = weight_surf.get_rect(center=midpoint)
+            pygame.draw.rect(screen, BG_COLOR, rect.inflate(4, 4))
+            screen.blit(weight_surf, rect)
+
     def handle_click(self, pos, button):
         x, y = pos
+        r2 = NODE_RADIUS * NODE_RADIUS
+        # Compare squared distances, no sqrt
         for node in self.nodes:
-            if ((x - node.x)**2 + (y - node.y)**2)**0.5 < NODE_RADIUS:
+            dx = x - node.x
+            dy = y - node.y
+            if dx*dx + dy*dy < r2:
                 if button == 1:
                     if self.start_node: self.start_node.is_start = False
                     node.is_start = True
@@ -162,39 +248,49 @@ class SearchTree:
                 return
 
     def reset_search(self):
+        self.dirty = True
         self.priority_queue = []
+        self._current_ref = None
         self.running = False
         self.completed = False
         self.message = "Press SPACE to Step"
+        self.path_points = []
         for node in self.nodes:
             node.reset()
         
         if self.start_node and self.goal_node:
             self.start_node.g_cost = 0
-            self.priority_queue.append(self.start_node)
+            heapq.heappush(self.priority_queue, (0, next(self._counter), self.start_node))
             self.start_node.state = 'frontier'
+            self.start_node.update_state_id()
             self.message = "Ready. Priority Queue Init. Press SPACE."
 
     def step(self):
+        self.dirty = True
         if not self.running and not self.completed:
             self.running = True
         if self.completed: return
 
-        if not self.priority_queue:
+        # 1. Pop node with Lowest Cost
+        # A cheaper cost pushes a new entry instead of updating the old one,
+        # so outdated entries are skipped as they come out (lazy deletion)
+        while self.priority_queue:
+            cost, _, current = heapq.heappop(self.priority_queue)
+            if current.state == 'frontier' and cost == current.g_cost:
+                break
+        else:
             self.message = "Priority Queue Empty! Goal unreachable."
             self.completed = True
             return
 
-        # 1. Pop node with Lowest Cost
-        # Sort queue to simulate Priority Queue pop
-        self.priority_queue.sort(key=lambda n: n.g_cost)
-        current = self.priority_queue.pop(0)
-
         # Visual cleanup
-        for n in self.nodes: 
-            if n.is_current: n.is_current = False
+        if self._current_ref is not None:
+            self._current_ref.is_current = False
+            self._current_ref.update_state_id()
         current.is_current = True
+        self._current_ref = current
         current.state = 'visited'
+        current.update_state_id()
 
         # 2. Check Goal
         if current == self.goal_node:
@@ -204,77 +300,86 @@ class SearchTree:
             return
 
         # 3. Expand Neighbors
+        # Loop-invariant lookups bound to locals once
+        queue, counter, heappush = self.priority_queue, self._counter, heapq.heappush
+        current_cost = current.g_cost
         updates = 0
-        for child, weight in current.edges:
-            new_cost = current.g_cost + weight
+        for child, weight, _ in current.edges:
+            new_cost = current_cost + weight
             
-            if child.state == 'unvisited' and child not in self.priority_queue:
+            # RELAXATION STEP: Check if we found a cheaper way (unvisited nodes cost inf)
+            if new_cost < child.g_cost:
                 child.g_cost = new_cost
                 child.parent = current
-                child.state = 'frontier'
-                self.priority_queue.append(child)
+                child.state = 'frontier' # Re-evaluate if visited (optional in some implementations, but good for strict UCS)
+                child.update_state_id()
+                # Push the new cost; any older entry goes stale and is skipped when popped
+                heappush(queue, (new_cost, next(counter), child))
                 updates += 1
-            elif child.state == 'frontier' or child.state == 'visited':
-                # RELAXATION STEP: Check if we found a cheaper way
-                if new_cost < child.g_cost:
-                    child.g_cost = new_cost
-                    child.parent = current
-                    if child.state == 'visited':
-                        child.state = 'frontier' # Re-evaluate if visited (optional in some implementations, but good for strict UCS)
-                        self.priority_queue.append(child)
-                    updates += 1
         
-        # Sort again for visual consistency immediately
-        self.priority_queue.sort(key=lambda n: n.g_cost)
         self.message = f" expanded Node {current.id} (g={current.g_cost}). Updated {updates} neighbors."
 
     def reconstruct_path(self, current):
         temp = current
         while temp:
             temp.in_final_path = True
+            temp.update_state_id()
+            self.path_points.append((temp.x, temp.y))
             temp = temp.parent
 
 # --- UI Functions ---
 
-def draw_sidebar(screen, font, tree):
-    rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, SIDEBAR_BG, rect)
-    pygame.draw.line(screen, (100,100,100), (WIDTH - SIDEBAR_WIDTH, 0), (WIDTH - SIDEBAR_WIDTH, HEIGHT), 2)
+LEGEND_ITEMS = [("Start", COLOR_START), ("Goal", COLOR_GOAL), 
+                ("Current", COLOR_CURRENT), ("PriorityQ", COLOR_FRONTIER)]
+SIDEBAR_STATIC = None # Background, headings and legend; built on first draw_sidebar call
+CONTROL_LABELS = []   # Rendered controls text (drawn last, the status box can reach it)
+
+def build_sidebar_static(font, sub_font, small_font):
+    """Renders the parts of the sidebar that never change onto one surface."""
+    surf = pygame.Surface((SIDEBAR_WIDTH, HEIGHT)).convert()
+    surf.fill(SIDEBAR_BG)
+    pygame.draw.line(surf, (100,100,100), (0, 0), (0, HEIGHT), 2)
 
     # Header
     title = font.render("UCS Simulation", True, (255, 255, 255))
-    screen.blit(title, (WIDTH - SIDEBAR_WIDTH + 20, 20))
+    surf.blit(title, (20, 20))
     
-    sub = pygame.font.SysFont('arial', 16).render("Uniform Cost Search", True, (150, 150, 150))
-    screen.blit(sub, (WIDTH - SIDEBAR_WIDTH + 20, 50))
+    sub = sub_font.render("Uniform Cost Search", True, (150, 150, 150))
+    surf.blit(sub, (20, 50))
 
     # Legend
     y_offset = 90
-    small_font = pygame.font.SysFont('arial', 18)
-    legend = [("Start", COLOR_START), ("Goal", COLOR_GOAL), 
-              ("Current", COLOR_CURRENT), ("PriorityQ", COLOR_FRONTIER)]
-    
-    for text, color in legend:
-        pygame.draw.circle(screen, color, (WIDTH - SIDEBAR_WIDTH + 30, y_offset + 10), 8)
+    for text, color in LEGEND_ITEMS:
+        pygame.draw.circle(surf, color, (30, y_offset + 10), 8)
         label = small_font.render(text, True, TEXT_COLOR)
-        screen.blit(label, (WIDTH - SIDEBAR_WIDTH + 50, y_offset))
+        surf.blit(label, (50, y_offset))
         y_offset += 30
         
     y_offset += 20
     
     # Priority Queue List
     pq_title = font.render("Priority Queue", True, (255, 255, 255))
-    screen.blit(pq_title, (WIDTH - SIDEBAR_WIDTH + 20, y_offset))
+    surf.blit(pq_title, (20, y_offset))
     y_offset += 30
     
     sub_pq = small_font.render("(Sorted by Cost)", True, (150, 150, 150))
-    screen.blit(sub_pq, (WIDTH - SIDEBAR_WIDTH + 20, y_offset))
-    y_offset += 30
+    surf.blit(sub_pq, (20, y_offset))
+    return surf
+
+def draw_sidebar(screen, font, sub_font, small_font, tree):
+    global SIDEBAR_STATIC
+    if SIDEBAR_STATIC is None:
+        SIDEBAR_STATIC = build_sidebar_static(font, sub_font, small_font)
+        CONTROL_LABELS.append(small_font.render("Space: Step | R: Reset | N: New Tree", True, (150,150,150)).convert_alpha())
+
+    # Background, headings and legend
+    screen.blit(SIDEBAR_STATIC, (WIDTH - SIDEBAR_WIDTH, 0))
+    y_offset = 90 + 30 * len(LEGEND_ITEMS) + 20 + 60 # Below the legend and headings
 
     # Draw Queue Items (Vertical List for details)
-    for i, node in enumerate(tree.priority_queue):
-        if i > 12: break
-        
+    # Only the 13 shown rows are pulled out of the heap (stale entries skipped)
+    live = (entry for entry in tree.priority_queue if entry[2].state == 'frontier' and entry[0] == entry[2].g_cost)
+    for _, _, node in heapq.nsmallest(13, live):
         # Row Background
         row_color = (60, 60, 60)
         pygame.draw.rect(screen, row_color, (WIDTH - SIDEBAR_WIDTH + 10, y_offset, SIDEBAR_WIDTH - 20, 25))
@@ -289,24 +394,18 @@ def draw_sidebar(screen, font, tree):
     y_offset = max(y_offset + 20, 600)
     pygame.draw.rect(screen, (20, 20, 20), (WIDTH - SIDEBAR_WIDTH + 10, y_offset, SIDEBAR_WIDTH - 20, 80))
     
-    words = tree.message.split(' ')
-    lines = []
-    curr = []
-    for w in words:
-        curr.append(w)
-        if len(' '.join(curr)) > 25:
-            lines.append(' '.join(curr[:-1]))
-            curr = [w]
-    lines.append(' '.join(curr))
+    # Wrap and render only when the message changed
+    if tree.message_surfs is None:
+        lines = wrap_text(tree.message, small_font, SIDEBAR_WIDTH - 40)
+        tree.message_surfs = [small_font.render(line, True, (0, 255, 255)).convert_alpha() for line in lines]
     
-    for i, line in enumerate(lines):
-        msg = small_font.render(line, True, (0, 255, 255))
+    for i, msg in enumerate(tree.message_surfs):
         screen.blit(msg, (WIDTH - SIDEBAR_WIDTH + 20, y_offset + 10 + i * 20))
 
     # Controls
     ctrl_y = HEIGHT - 100
-    ctrl_txt = small_font.render("Space: Step | R: Reset | N: New Tree", True, (150,150,150))
-    screen.blit(ctrl_txt, (WIDTH - SIDEBAR_WIDTH + 20, ctrl_y))
+    for ctrl_txt in CONTROL_LABELS:
+        screen.blit(ctrl_txt, (WIDTH - SIDEBAR_WIDTH + 20, ctrl_y))
 
 def main():
     pygame.init()
@@ -317,15 +416,25 @@ def main():
     font = pygame.font.SysFont('arial', 22, bold=True)
     small_font = pygame.font.SysFont('arial', 16)
     edge_font = pygame.font.SysFont('arial', 14, bold=True)
+    sidebar_font = pygame.font.SysFont('arial', 18)
 
     tree = SearchTree()
     tree.generate_tree()
 
     running = True
     while running:
-        for event in pygame.event.get():
+        # The scene only changes on user input, so when nothing is pending a
+        # redraw we block until the next event instead of polling at FPS
+        if tree.dirty:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait()] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                tree.dirty = True
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not tree.running and not tree.completed:
                     tree.handle_click(pygame.mouse.get_pos(), event.button)
@@ -339,19 +448,22 @@ def main():
                     tree.generate_tree()
                     tree.reset_search()
 
-        screen.fill(BG_COLOR)
-        
-        # Draw Edges first
-        for node in tree.nodes:
-            node.draw_edges(screen, edge_font)
-            
-        # Draw Nodes
-        for node in tree.nodes:
-            node.draw_body(screen, font, small_font)
+        # Drawing (only when something changed)
+        if tree.dirty:
+            screen.fill(BG_COLOR)
+
+            # Draw Edges first
+            tree.draw_edges(screen, edge_font)
+
+            # Draw Nodes
+            for node in tree.nodes:
+                node.draw_body(screen, font, small_font)
+
+            draw_sidebar(screen, font, small_font, sidebar_font, tree)
 
-        draw_sidebar(screen, font, tree)
+            pygame.display.flip()
+            tree.dirty = False
 
-        pygame.display.flip()
         clock.tick(FPS)
 
     pygame.quit()